@@ -10,12 +10,12 @@ import { fetchRepository } from './github/fetcher.js';
 import { buildConfig, getDefaultOptions } from './config/builder.js';
 import { scanDirectory } from './core/scanner.js';
 import { FileFilter } from './core/filter.js';
-import { loadGitignore, getTrackedFiles } from './core/git.js';
+import { loadGitignore, getTrackedFiles, getIgnoredPaths } from './core/git.js';
 import { readFiles } from './core/reader.js';
 import { analyzeProject } from './core/analyzer.js';
-import { formatPreview, formatSummary, formatFull } from './formatters/markdown.js';
+import { formatPreview, formatSummary, formatFullParts } from './formatters/markdown.js';
 import { formatJson } from './formatters/json.js';
-import { writeOutput } from './output/writer.js';
+import { writeOutput, contentLength, type OutputContent } from './output/writer.js';
 import { runInteractiveConfig } from './interactive/wizard.js';
 import { ensureFirstRunSetup } from './interactive/firstRun.js';
 import { Defaults } from './constants/defaults.js';
@@ -185,16 +185,22 @@ async function run(rootDirArg: string, opts: Record<string, unknown>): Promise<v
 
   // Scan directory
   const spinner = ora('Scanning files...').start();
-  const scanResult = await scanDirectory(config);
+  const scanResult = await scanDirectory(config, trackedFiles);
+
+  // Batch-resolve gitignore status for all candidates in one git call;
+  // falls back to the JS matcher when git isn't available.
+  let ignoredPaths = null;
+  if (config.gitMode === 'gitignore' || config.gitMode === 'full') {
+    ignoredPaths = getIgnoredPaths(config.rootDir, scanResult.files.map((f) => f.relPath));
+  }
 
   // Apply filters
-  const filter = new FileFilter(config, gitignoreMatcher, trackedFiles);
-  const filteredPaths = scanResult.includedPaths.filter((path) => {
-    const result = filter.shouldInclude(path);
-    return result.passes;
-  });
+  const filter = new FileFilter(config, gitignoreMatcher, trackedFiles, ignoredPaths);
+  const filteredFiles = scanResult.files.filter(
+    (f) => filter.shouldInclude(f.absPath, f.relPath).passes
+  );
 
-  if (filteredPaths.length === 0) {
+  if (filteredFiles.length === 0) {
     spinner.warn('No files matched the filters');
     if (!options.dryRun) {
       if (config.outputMode === 'stdout') {
@@ -204,10 +210,10 @@ async function run(rootDirArg: string, opts: Record<string, unknown>): Promise<v
     return;
   }
 
-  spinner.text = `Reading ${filteredPaths.length} files...`;
+  spinner.text = `Reading ${filteredFiles.length} files...`;
 
   // Read files
-  const files = readFiles(filteredPaths, config);
+  const files = await readFiles(filteredFiles, config);
 
   spinner.text = 'Analyzing project...';
 
@@ -217,20 +223,28 @@ async function run(rootDirArg: string, opts: Record<string, unknown>): Promise<v
 
   spinner.succeed(`Found ${result.files.length} files`);
 
-  // Format output
-  let content: string;
-  let summary: string;
+  // Format output; the full markdown path stays chunked so the writer
+  // can stream it. The stdout sink never prints the summary, so skip
+  // building it (for JSON, a second full stringify) unless --show-stats
+  // asks for it anyway.
+  const needSummary = options.showStats || config.outputMode !== 'stdout';
+  let content: OutputContent;
+  let summary = '';
 
   if (config.outputFormat === 'json') {
     content = formatJson(result, true);
-    summary = formatJson(result, false);
+    if (needSummary) {
+      summary = formatJson(result, false);
+    }
   } else {
     if (options.preview) {
       content = formatPreview(result);
       summary = content;
     } else {
-      content = formatFull(result);
-      summary = formatSummary(result);
+      content = formatFullParts(result);
+      if (needSummary) {
+        summary = formatSummary(result);
+      }
     }
   }
 
@@ -238,7 +252,7 @@ async function run(rootDirArg: string, opts: Record<string, unknown>): Promise<v
   if (options.dryRun) {
     console.log(chalk.cyan('\n🔍 Dry Run Complete'));
     console.log(`   Files: ${result.files.length.toLocaleString()}`);
-    console.log(`   Output size: ${content.length.toLocaleString()} chars`);
+    console.log(`   Output size: ${contentLength(content).toLocaleString()} chars`);
     return;
   }
 
@@ -1,5 +1,6 @@
 import type { CLIOptions, ScanConfig, GitHubRepo, GitMode, OutputMode } from '../types/index.js';
 import { ExcludedDirs, Defaults } from '../constants/defaults.js';
+import { compilePatterns } from '../core/filter.js';
 
 export function parseSize(sizeStr: string): number | undefined {
   if (!sizeStr) return undefined;
@@ -72,23 +73,27 @@ export function buildConfig(
     includedPatterns.add(`*${normalized}`);
   }
 
-  // Build type overrides
-  const typeOverrides = new Map<string, boolean>([
-    ['.json', options.includeJson],
-    ['.jsonc', options.includeJson],
-    ['.yaml', options.includeYaml],
-    ['.yml', options.includeYaml],
-    ['.xml', options.includeXml],
-    ['.html', options.includeHtml],
-    ['.htm', options.includeHtml],
-    ['.css', options.includeCss],
-    ['.sql', options.includeSql],
-    ['.csv', options.includeCsv],
-    ['.tsv', options.includeCsv],
-    ['.md', options.includeMarkdown],
-    ['.markdown', options.includeMarkdown],
-    ['.rst', options.includeMarkdown],
-  ]);
+  // Build type overrides. Only enabled flags matter downstream, so the
+  // config carries just the opted-in suffixes and the per-file check is
+  // a single set membership test.
+  const overrideFlags: Array<[boolean, string[]]> = [
+    [options.includeJson, ['.json', '.jsonc']],
+    [options.includeYaml, ['.yaml', '.yml']],
+    [options.includeXml, ['.xml']],
+    [options.includeHtml, ['.html', '.htm']],
+    [options.includeCss, ['.css']],
+    [options.includeSql, ['.sql']],
+    [options.includeCsv, ['.csv', '.tsv']],
+    [options.includeMarkdown, ['.md', '.markdown', '.rst']],
+  ];
+  const typeOverrides = new Set<string>();
+  for (const [enabled, suffixes] of overrideFlags) {
+    if (enabled) {
+      for (const suffix of suffixes) {
+        typeOverrides.add(suffix);
+      }
+    }
+  }
 
   return {
     rootDir,
@@ -105,9 +110,13 @@ export function buildConfig(
     includeOnlyMode: options.includeOnly,
     truncateLargeFiles: options.truncateLargeFiles,
     skipLargeFiles: options.skipLargeFiles,
-    excludedDirs: new Set(ExcludedDirs),
+    // The module-level set is shared, never copied: every consumer only
+    // reads it, and ReadonlySet on ScanConfig enforces that.
+    excludedDirs: ExcludedDirs,
     excludedPatterns,
     includedPatterns,
+    excludeRe: compilePatterns(excludedPatterns),
+    includeRe: compilePatterns(includedPatterns),
     typeOverrides,
     githubRepo,
   };
@@ -93,6 +93,20 @@ export const AlwaysSkip = new Set([
   '.prettierignore', '.eslintignore',
 ]);
 
+// Lowercase-normalized lookups so README.MD, Dockerfile variants etc.
+// behave the same on case-insensitive filesystems. Normalized once at
+// module load instead of per membership test.
+const AlwaysIncludeLower = new Set([...AlwaysInclude].map((name) => name.toLowerCase()));
+const AlwaysSkipLower = new Set([...AlwaysSkip].map((name) => name.toLowerCase()));
+
+export function isAlwaysIncluded(name: string): boolean {
+  return AlwaysIncludeLower.has(name.toLowerCase());
+}
+
+export function isAlwaysSkipped(name: string): boolean {
+  return AlwaysSkipLower.has(name.toLowerCase());
+}
+
 export const GLYPH_CHILD = '├──';
 export const GLYPH_LAST = '└──';
 export const GLYPH_PIPE = '│   ';
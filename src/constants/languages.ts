@@ -101,9 +101,21 @@ export const TECH_STACK_MAPPING: Record<string, string[]> = {
   'C++': ['.cpp', '.cc', '.hpp'],
 };
 
-export function getLanguage(filename: string, extension: string): string {
+// Inverted once at module load so tech detection is a single map
+// lookup per file instead of a scan over every stack's extension list.
+export const SUFFIX_TO_TECH: ReadonlyMap<string, string> = new Map(
+  Object.entries(TECH_STACK_MAPPING).flatMap(([tech, exts]) =>
+    exts.map((ext): [string, string] => [ext, tech])
+  )
+);
+
+export function getLanguage(filename: string): string {
   if (filename === 'Dockerfile') return 'dockerfile';
   if (filename === 'Makefile') return 'makefile';
   if (filename.startsWith('.env')) return 'dotenv';
-  return LANGUAGE_HINTS[extension.toLowerCase()] ?? '';
+  // Derive the extension with plain string ops; an extname() call per
+  // file is needless when the hint table is keyed by lowercase suffix.
+  const dot = filename.lastIndexOf('.');
+  if (dot <= 0) return '';
+  return LANGUAGE_HINTS[filename.slice(dot).toLowerCase()] ?? '';
 }
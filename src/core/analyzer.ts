@@ -1,7 +1,6 @@
 import type { FileInfo, ScanResult, ScanConfig, TreeNode } from '../types/index.js';
-import { TECH_STACK_MAPPING } from '../constants/languages.js';
-import { AlwaysInclude } from '../constants/defaults.js';
-import { extname, dirname } from 'node:path';
+import { SUFFIX_TO_TECH } from '../constants/languages.js';
+import { isAlwaysIncluded } from '../constants/defaults.js';
 
 export function analyzeProject(
   files: FileInfo[],
@@ -9,22 +8,33 @@ export function analyzeProject(
   totalScanned: number,
   duration: number
 ): ScanResult {
-  // Calculate percentages
-  const totalChars = files.reduce((sum, f) => sum + f.charCount, 0);
+  // One pass gathers everything that only needs per-file facts:
+  // totals, the numbered-name census for sort selection, tech-stack
+  // detection and per-directory counts.
+  let totalChars = 0;
+  let totalLines = 0;
+  let numberedCount = 0;
+  const techStack = new Set<string>();
+  const dirCounts = new Map<string, number>();
+
   for (const f of files) {
-    f.percentage = totalChars > 0 ? (f.charCount / totalChars) * 100 : 0;
+    totalChars += f.charCount;
+    totalLines += f.lineCount;
+    if (/^\d+_/.test(f.fileName)) {
+      numberedCount++;
+    }
+    detectTech(f, techStack);
+    // Relative paths are POSIX-normalized, so the parent directory is
+    // a plain slice — no path-library call in the per-file loop.
+    const slash = f.relativePath.lastIndexOf('/');
+    if (slash !== -1) {
+      const dir = f.relativePath.slice(0, slash);
+      dirCounts.set(dir, (dirCounts.get(dir) ?? 0) + 1);
+    }
   }
 
-  // Sort files
-  const sortedFiles = sortFiles(files, config);
-
-  // Detect tech stack
-  const techStack = detectTechStack(sortedFiles);
-
-  // Find key directories
-  const keyDirs = findKeyDirectories(sortedFiles);
-
-  // Build tree
+  const sortedFiles = sortFiles(files, config, numberedCount);
+  const keyDirs = rankKeyDirectories(dirCounts);
   const tree = buildTree(sortedFiles);
 
   return {
@@ -32,19 +42,38 @@ export function analyzeProject(
     files: sortedFiles,
     tree,
     totalScanned,
+    totalLines,
+    totalChars,
     techStack,
     keyDirs,
     duration,
   };
 }
 
-function sortFiles(files: FileInfo[], config: ScanConfig): FileInfo[] {
+// Decorate-sort-undecorate: comparator-time key derivation (splits,
+// lowercasing, regex) runs O(n log n) times, so keys are computed once
+// per file up front instead.
+function sortWithKeys<K>(
+  files: FileInfo[],
+  makeKey: (f: FileInfo) => K,
+  compare: (a: K, b: K) => number
+): FileInfo[] {
+  return files
+    .map((file) => ({ file, key: makeKey(file) }))
+    .sort((a, b) => compare(a.key, b.key))
+    .map((entry) => entry.file);
+}
+
+function sortFiles(files: FileInfo[], config: ScanConfig, numberedCount: number): FileInfo[] {
   if (config.sortAlphabetically) {
-    return [...files].sort((a, b) => a.relativePath.toLowerCase().localeCompare(b.relativePath.toLowerCase()));
+    return sortWithKeys(
+      files,
+      (f) => f.relativePath.toLowerCase(),
+      (a, b) => a.localeCompare(b)
+    );
   }
 
-  // Check for numbered files
-  const numberedCount = files.filter((f) => /^\d+_/.test(f.relativePath.split('/').pop() ?? '')).length;
+  // Mostly-numbered projects (course material etc.) sort numerically
   if (numberedCount > files.length / 2) {
     return sortNumbered(files);
   }
@@ -52,70 +81,73 @@ function sortFiles(files: FileInfo[], config: ScanConfig): FileInfo[] {
   return sortByImportance(files);
 }
 
+interface NumberedKey {
+  // NaN marks un-numbered names, which sort after all numbered ones
+  num: number;
+  nameLower: string;
+}
+
 function sortNumbered(files: FileInfo[]): FileInfo[] {
-  return [...files].sort((a, b) => {
-    const aName = a.relativePath.split('/').pop() ?? '';
-    const bName = b.relativePath.split('/').pop() ?? '';
-    const aMatch = /^(\d+)_/.exec(aName);
-    const bMatch = /^(\d+)_/.exec(bName);
-
-    if (aMatch && bMatch) {
-      return parseInt(aMatch[1]!, 10) - parseInt(bMatch[1]!, 10);
+  return sortWithKeys(
+    files,
+    (f): NumberedKey => {
+      const match = /^(\d+)_/.exec(f.fileName);
+      return {
+        num: match ? parseInt(match[1]!, 10) : NaN,
+        nameLower: f.fileName.toLowerCase(),
+      };
+    },
+    (a, b) => {
+      const aNumbered = !Number.isNaN(a.num);
+      const bNumbered = !Number.isNaN(b.num);
+      if (aNumbered && bNumbered) return a.num - b.num;
+      if (aNumbered) return -1;
+      if (bNumbered) return 1;
+      return a.nameLower.localeCompare(b.nameLower);
     }
-    if (aMatch) return -1;
-    if (bMatch) return 1;
-    return aName.toLowerCase().localeCompare(bName.toLowerCase());
-  });
+  );
 }
 
-function sortByImportance(files: FileInfo[]): FileInfo[] {
-  return [...files].sort((a, b) => {
-    const aName = a.relativePath.split('/').pop() ?? '';
-    const bName = b.relativePath.split('/').pop() ?? '';
-    const aDepth = a.relativePath.split('/').length;
-    const bDepth = b.relativePath.split('/').length;
-
-    // README first
-    if (aName.toLowerCase().startsWith('readme')) return -1;
-    if (bName.toLowerCase().startsWith('readme')) return 1;
-
-    // AlwaysInclude files next
-    if (AlwaysInclude.has(aName) && !AlwaysInclude.has(bName)) return -1;
-    if (AlwaysInclude.has(bName) && !AlwaysInclude.has(aName)) return 1;
-
-    // Then by depth
-    if (aDepth !== bDepth) return aDepth - bDepth;
-
-    return aName.toLowerCase().localeCompare(bName.toLowerCase());
-  });
+interface ImportanceKey {
+  // 0 = README, 1 = always-include files, 2 = everything else
+  rank: number;
+  depth: number;
+  nameLower: string;
 }
 
-function detectTechStack(files: FileInfo[]): Set<string> {
-  const tech = new Set<string>();
-
-  for (const file of files) {
-    const ext = extname(file.relativePath).toLowerCase();
-    for (const [techName, extensions] of Object.entries(TECH_STACK_MAPPING)) {
-      if (extensions.includes(ext)) {
-        tech.add(techName);
-        break;
+function sortByImportance(files: FileInfo[]): FileInfo[] {
+  return sortWithKeys(
+    files,
+    (f): ImportanceKey => {
+      const nameLower = f.fileName.toLowerCase();
+      let rank = 2;
+      if (nameLower.startsWith('readme')) {
+        rank = 0;
+      } else if (isAlwaysIncluded(f.fileName)) {
+        rank = 1;
       }
+      return { rank, depth: f.relativePath.split('/').length, nameLower };
+    },
+    (a, b) => {
+      if (a.rank !== b.rank) return a.rank - b.rank;
+      if (a.depth !== b.depth) return a.depth - b.depth;
+      return a.nameLower.localeCompare(b.nameLower);
     }
-  }
-
-  return tech;
+  );
 }
 
-function findKeyDirectories(files: FileInfo[]): string[] {
-  const counts = new Map<string, number>();
-
-  for (const file of files) {
-    const dir = dirname(file.relativePath);
-    if (dir !== '.') {
-      counts.set(dir, (counts.get(dir) ?? 0) + 1);
-    }
+function detectTech(file: FileInfo, tech: Set<string>): void {
+  const dot = file.fileName.lastIndexOf('.');
+  if (dot <= 0) {
+    return;
+  }
+  const techName = SUFFIX_TO_TECH.get(file.fileName.slice(dot).toLowerCase());
+  if (techName !== undefined) {
+    tech.add(techName);
   }
+}
 
+function rankKeyDirectories(counts: Map<string, number>): string[] {
   return [...counts.entries()]
     .sort((a, b) => b[1] - a[1])
     .slice(0, 10)
@@ -123,76 +155,56 @@ function findKeyDirectories(files: FileInfo[]): string[] {
 }
 
 function buildTree(files: FileInfo[]): TreeNode[] {
-  const fileMap = new Map<string, FileInfo>();
-  for (const f of files) {
-    fileMap.set(f.relativePath, f);
-  }
-
-  // Collect all paths including parent directories
-  const allPaths = new Set<string>();
-  for (const f of files) {
-    allPaths.add(f.relativePath);
-    const parts = f.relativePath.split('/');
-    for (let i = 1; i < parts.length; i++) {
-      allPaths.add(parts.slice(0, i).join('/'));
+  // Sibling order is a per-level name sort. Sorting whole paths with
+  // the separator remapped below every other character reproduces
+  // exactly that order in one pass, so nodes can be emitted directly
+  // in output order with a running directory stack — no intermediate
+  // dict-of-dicts and no second conversion walk. Every path here
+  // belongs to an included file, so every emitted node is included.
+  const ordered = files
+    .map((file) => ({ file, key: file.relativePath.split('/').join('\0') }))
+    .sort((a, b) => (a.key < b.key ? -1 : a.key > b.key ? 1 : 0));
+
+  const rootNodes: TreeNode[] = [];
+  // Open directory chain from the root down to the insertion point.
+  const stack: TreeNode[] = [];
+
+  for (const { file } of ordered) {
+    const parts = file.relativePath.split('/');
+
+    // Keep the open directories this path shares; deeper ones are
+    // complete. Positional name equality implies the same parent
+    // chain because the paths arrive grouped by prefix.
+    let common = 0;
+    while (common < stack.length && common < parts.length - 1 && stack[common]!.name === parts[common]) {
+      common++;
     }
-  }
-
-  // Build nested structure
-  type TreeDict = { [key: string]: TreeDict };
-  const treeDict: TreeDict = {};
-
-  for (const path of [...allPaths].sort()) {
-    const parts = path.split('/');
-    let current = treeDict;
-    for (const part of parts) {
-      if (!(part in current)) {
-        current[part] = {};
-      }
-      current = current[part]!;
-    }
-  }
-
-  // Convert to TreeNode
-  function convert(dict: TreeDict, currentPath: string): TreeNode[] {
-    const nodes: TreeNode[] = [];
-
-    for (const name of Object.keys(dict).sort()) {
-      const childDict = dict[name]!;
-      const path = currentPath ? `${currentPath}/${name}` : name;
-      const isDir = Object.keys(childDict).length > 0;
-
-      if (isDir) {
-        const children = convert(childDict, path);
-        const included = children.some((c) => c.included);
-        nodes.push({
-          name,
-          path,
-          isDir: true,
-          included,
-          children,
-          lines: 0,
-          chars: 0,
-          percentage: 0,
-        });
-      } else {
-        const file = fileMap.get(path);
-        const included = file !== undefined;
-        nodes.push({
-          name,
-          path,
-          isDir: false,
-          included,
-          children: [],
-          lines: file?.lineCount ?? 0,
-          chars: file?.charCount ?? 0,
-          percentage: file?.percentage ?? 0,
-        });
-      }
+    stack.length = common;
+
+    for (let i = common; i < parts.length - 1; i++) {
+      const parent = stack[stack.length - 1];
+      const node: TreeNode = {
+        name: parts[i]!,
+        path: parent ? `${parent.path}/${parts[i]!}` : parts[i]!,
+        isDir: true,
+        included: true,
+        children: [],
+        lines: 0,
+      };
+      (parent ? parent.children : rootNodes).push(node);
+      stack.push(node);
     }
 
-    return nodes;
+    const parent = stack[stack.length - 1];
+    (parent ? parent.children : rootNodes).push({
+      name: parts[parts.length - 1]!,
+      path: file.relativePath,
+      isDir: false,
+      included: true,
+      children: [],
+      lines: file.lineCount,
+    });
   }
 
-  return convert(treeDict, '');
+  return rootNodes;
 }
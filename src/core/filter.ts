@@ -1,118 +1,257 @@
-import { readFileSync, statSync, openSync, readSync, closeSync } from 'node:fs';
-import { basename, extname, relative } from 'node:path';
-import { minimatch } from 'minimatch';
+import { readFileSync, statSync, openSync, readSync, closeSync, type Stats } from 'node:fs';
+import { relative } from 'node:path';
+import { makeRe, minimatch } from 'minimatch';
 import type { Ignore } from 'ignore';
 import type { ScanConfig, FilterResult } from '../types/index.js';
 import {
-  AlwaysSkip,
-  AlwaysInclude,
+  isAlwaysSkipped,
+  isAlwaysIncluded,
   ExcludedPatterns,
   DataPatterns,
   ConfigSkip,
 } from '../constants/defaults.js';
+import { LANGUAGE_HINTS } from '../constants/languages.js';
+
+// Extensions whose text/binary nature is already known, so the
+// null-byte sniff (an open+read per file) can be skipped entirely.
+const KnownTextExts = new Set(Object.keys(LANGUAGE_HINTS));
+const KnownBinaryExts = new Set([
+  '.pyc', '.pyo', '.pyd', '.so', '.o', '.a', '.lib', '.dylib', '.dll',
+  '.exe', '.class', '.jar', '.war',
+  '.png', '.jpg', '.jpeg', '.gif', '.ico', '.webp', '.bmp', '.tiff', '.tif',
+  '.woff', '.woff2', '.ttf', '.eot', '.otf',
+  '.mp3', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.wav', '.ogg',
+  '.zip', '.tar', '.gz', '.rar', '.7z', '.bz2', '.pdf',
+]);
 
 function getRelPath(absPath: string, rootDir: string): string {
   return relative(rootDir, absPath).split('\\').join('/');
 }
 
-export interface FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult;
+// Compile a set of glob patterns into a single alternation regex once,
+// so the per-file check is one C-level match instead of a minimatch
+// call per pattern.
+export function compilePatterns(patterns: Iterable<string>): RegExp | null {
+  const sources: string[] = [];
+  for (const pattern of patterns) {
+    const re = makeRe(pattern);
+    if (re) {
+      sources.push(`(?:${re.source})`);
+    }
+  }
+  return sources.length > 0 ? new RegExp(sources.join('|')) : null;
 }
 
-class SkipListRule implements FilterRule {
-  check(absPath: string, _config: ScanConfig): FilterResult {
-    const name = basename(absPath);
-    if (AlwaysSkip.has(name)) {
-      return { passes: false, reason: `In skip list: ${name}` };
+// The default pattern lists are mostly plain '*.ext' suffixes and
+// literal filenames; only a handful are real globs. Classify them once
+// at module load so the per-file check is two set lookups with a
+// small residual regex, instead of one big alternation for everything.
+// Suffix and literal buckets match case-insensitively, consistent with
+// the always-include/skip lists.
+interface PatternBuckets {
+  extSet: Set<string>;
+  nameSet: Set<string>;
+  residualRe: RegExp | null;
+  residual: string[];
+}
+
+function classifyPatterns(patterns: Iterable<string>): PatternBuckets {
+  const extSet = new Set<string>();
+  const nameSet = new Set<string>();
+  const residual: string[] = [];
+
+  for (const pattern of patterns) {
+    const extMatch = /^\*(\.[^*?[\]{}.]+)$/.exec(pattern);
+    if (extMatch) {
+      extSet.add(extMatch[1]!.toLowerCase());
+    } else if (!/[*?[\]{}]/.test(pattern)) {
+      nameSet.add(pattern.toLowerCase());
+    } else {
+      residual.push(pattern);
     }
-    return { passes: true, reason: '' };
   }
+
+  return { extSet, nameSet, residualRe: compilePatterns(residual), residual };
+}
+
+// Returns the matching pattern (for the reason string) or null.
+function matchBuckets(buckets: PatternBuckets, ctx: FileContext): string | null {
+  const ext = ctx.ext();
+  if (ext && buckets.extSet.has(ext)) {
+    return `*${ext}`;
+  }
+  if (buckets.nameSet.has(ctx.name.toLowerCase())) {
+    return ctx.name;
+  }
+  if (buckets.residualRe && buckets.residualRe.test(ctx.name)) {
+    return findMatchingPattern(buckets.residual, ctx.name);
+  }
+  return null;
 }
 
-class DirectoryRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
-    const relPath = getRelPath(absPath, config.rootDir);
-    const parts = relPath.split('/');
-    
-    // Check all parent directories (not the file itself)
-    for (let i = 0; i < parts.length - 1; i++) {
-      const part = parts[i]!;
-      
-      // Check if in excluded dirs
-      if (config.excludedDirs.has(part)) {
-        return { passes: false, reason: `In excluded dir: ${part}` };
+const DefaultExcludeBuckets = classifyPatterns(ExcludedPatterns);
+const DataPatternBuckets = classifyPatterns(DataPatterns);
+const ConfigSkipBuckets = classifyPatterns(ConfigSkip);
+
+// Slow path for reason strings: only runs after the alternation regex
+// already matched, so the per-pattern scan is paid on rejected files
+// alone, not on the hot accept path.
+function findMatchingPattern(patterns: Iterable<string>, ...candidates: string[]): string {
+  for (const pattern of patterns) {
+    for (const candidate of candidates) {
+      if (minimatch(candidate, pattern)) {
+        return pattern;
       }
-      
-      // Check if dir matches any excluded pattern
-      for (const pattern of config.excludedPatterns) {
-        if (minimatch(part, pattern)) {
-          return { passes: false, reason: `Dir matches pattern: ${pattern}` };
-        }
+    }
+  }
+  return '?';
+}
+
+// Per-file state computed once and shared across the rule chain, so a
+// file pays for basename, relative-path and stat at most once no
+// matter how many rules consult them.
+export class FileContext {
+  readonly absPath: string;
+  readonly name: string;
+  readonly relPath: string;
+  private statResult: Stats | null | undefined;
+  private extLower: string | undefined;
+  private cliIncluded: boolean | undefined;
+
+  constructor(absPath: string, rootDir: string, relPath?: string) {
+    this.absPath = absPath;
+    this.relPath = relPath ?? getRelPath(absPath, rootDir);
+    // The relative path is POSIX-normalized, so the basename is a
+    // plain slice — no path-library call per file.
+    const slash = this.relPath.lastIndexOf('/');
+    this.name = slash === -1 ? this.relPath : this.relPath.slice(slash + 1);
+  }
+
+  stat(): Stats | null {
+    if (this.statResult === undefined) {
+      try {
+        this.statResult = statSync(this.absPath);
+      } catch {
+        this.statResult = null;
       }
     }
-    
+    return this.statResult;
+  }
+
+  // Lowercased extension ('' for none/dotfiles), matching extname
+  // semantics without the per-rule recomputation.
+  ext(): string {
+    if (this.extLower === undefined) {
+      const dot = this.name.lastIndexOf('.');
+      this.extLower = dot > 0 ? this.name.slice(dot).toLowerCase() : '';
+    }
+    return this.extLower;
+  }
+
+  // Several rules ask "did a CLI --include pattern match this file?"
+  // against the same compiled regex; answer it once per file.
+  isCliIncluded(includeRe: RegExp | null): boolean {
+    if (this.cliIncluded === undefined) {
+      this.cliIncluded =
+        includeRe !== null && (includeRe.test(this.name) || includeRe.test(this.relPath));
+    }
+    return this.cliIncluded;
+  }
+}
+
+export interface FilterRule {
+  check(ctx: FileContext, config: ScanConfig): FilterResult;
+}
+
+class SkipListRule implements FilterRule {
+  check(ctx: FileContext, _config: ScanConfig): FilterResult {
+    if (isAlwaysSkipped(ctx.name)) {
+      return { passes: false, reason: `In skip list: ${ctx.name}` };
+    }
     return { passes: true, reason: '' };
   }
 }
 
 class PatternRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
-    const name = basename(absPath);
-    const relPath = getRelPath(absPath, config.rootDir);
-    
+  private excludeRe: RegExp | null;
+  private includeRe: RegExp | null;
+
+  constructor(excludeRe: RegExp | null, includeRe: RegExp | null) {
+    this.excludeRe = excludeRe;
+    this.includeRe = includeRe;
+  }
+
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
+    const { name, relPath } = ctx;
+
     // Check excludes first
-    for (const pattern of config.excludedPatterns) {
-      if (minimatch(name, pattern) || minimatch(relPath, pattern)) {
-        return { passes: false, reason: `Matches exclude: ${pattern}` };
-      }
+    if (this.excludeRe && (this.excludeRe.test(name) || this.excludeRe.test(relPath))) {
+      const pattern = findMatchingPattern(config.excludedPatterns, name, relPath);
+      return { passes: false, reason: `Matches exclude: ${pattern}` };
     }
-    
+
     // Include-only mode
     if (config.includeOnlyMode && config.includedPatterns.size > 0) {
-      for (const pattern of config.includedPatterns) {
-        if (minimatch(name, pattern) || minimatch(relPath, pattern) || minimatch(`**/${name}`, pattern)) {
-          return { passes: true, reason: '' };
-        }
+      if (ctx.isCliIncluded(this.includeRe) || (this.includeRe && this.includeRe.test(`**/${name}`))) {
+        return { passes: true, reason: '' };
       }
       return { passes: false, reason: 'No include pattern matched' };
     }
-    
+
     return { passes: true, reason: '' };
   }
 }
 
 class SizeRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
     if (config.maxSizeBytes === undefined) {
       return { passes: true, reason: '' };
     }
-    try {
-      const stat = statSync(absPath);
-      if (stat.size > config.maxSizeBytes) {
-        return { passes: false, reason: `Too large: ${stat.size.toLocaleString()} > ${config.maxSizeBytes.toLocaleString()}` };
-      }
-    } catch {
+    const stat = ctx.stat();
+    if (!stat) {
       return { passes: false, reason: 'Cannot stat file' };
     }
+    if (stat.size > config.maxSizeBytes) {
+      return { passes: false, reason: `Too large: ${stat.size.toLocaleString()} > ${config.maxSizeBytes.toLocaleString()}` };
+    }
     return { passes: true, reason: '' };
   }
 }
 
+// Reused across every sniff: the filter chain is synchronous, so one
+// scratch buffer is safe and avoids an 8 KiB allocation per file.
+const SniffBuffer = Buffer.allocUnsafe(8192);
+
 class BinaryRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
     if (config.includeBinary) {
       return { passes: true, reason: '' };
     }
+
+    const ext = ctx.ext();
+    if (KnownTextExts.has(ext)) {
+      return { passes: true, reason: '' };
+    }
+    if (KnownBinaryExts.has(ext)) {
+      return { passes: false, reason: 'Binary file (by extension)' };
+    }
+
+    // The size rule has usually stat-ed the file already; reuse that
+    // to skip the open/read pair for empty files, which are text.
+    const stat = ctx.stat();
+    if (stat && stat.size === 0) {
+      return { passes: true, reason: '' };
+    }
+
     try {
-      const buffer = Buffer.alloc(8192);
-      const fd = openSync(absPath, 'r');
-      const bytesRead = readSync(fd, buffer, 0, 8192, 0);
+      const fd = openSync(ctx.absPath, 'r');
+      const bytesRead = readSync(fd, SniffBuffer, 0, 8192, 0);
       closeSync(fd);
 
-      for (let i = 0; i < bytesRead; i++) {
-        if (buffer[i] === 0) {
-          return { passes: false, reason: 'Binary file' };
-        }
+      // subarray is a view, not a copy; includes() is a native memchr
+      // over it rather than a JS loop over the bytes.
+      if (SniffBuffer.subarray(0, bytesRead).includes(0)) {
+        return { passes: false, reason: 'Binary file' };
       }
     } catch {
       return { passes: false, reason: 'Cannot read file' };
@@ -122,48 +261,46 @@ class BinaryRule implements FilterRule {
 }
 
 class DefaultPatternRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
-    const name = basename(absPath);
-    const ext = extname(absPath).toLowerCase();
-    const relPath = getRelPath(absPath, config.rootDir);
+  private includeRe: RegExp | null;
+
+  constructor(includeRe: RegExp | null) {
+    this.includeRe = includeRe;
+  }
+
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
+    const { name } = ctx;
 
     // Always include special files
-    if (AlwaysInclude.has(name)) {
+    if (isAlwaysIncluded(name)) {
       return { passes: true, reason: '' };
     }
 
     // Check type overrides
-    const override = config.typeOverrides.get(ext);
-    if (override === true) {
+    if (config.typeOverrides.has(ctx.ext())) {
       return { passes: true, reason: '' };
     }
 
     // Check if explicitly included
-    for (const pattern of config.includedPatterns) {
-      if (minimatch(name, pattern) || minimatch(relPath, pattern)) {
-        return { passes: true, reason: '' };
-      }
+    if (ctx.isCliIncluded(this.includeRe)) {
+      return { passes: true, reason: '' };
     }
 
     // Check default excluded patterns
-    for (const pattern of ExcludedPatterns) {
-      if (minimatch(name, pattern)) {
-        return { passes: false, reason: `Default exclude: ${pattern}` };
-      }
+    const defaultHit = matchBuckets(DefaultExcludeBuckets, ctx);
+    if (defaultHit !== null) {
+      return { passes: false, reason: `Default exclude: ${defaultHit}` };
     }
 
     // Check data patterns
-    for (const pattern of DataPatterns) {
-      if (minimatch(name, pattern)) {
-        return { passes: false, reason: `Data format excluded: ${pattern}` };
-      }
+    const dataHit = matchBuckets(DataPatternBuckets, ctx);
+    if (dataHit !== null) {
+      return { passes: false, reason: `Data format excluded: ${dataHit}` };
     }
 
     // Check config skip
-    for (const pattern of ConfigSkip) {
-      if (minimatch(name, pattern)) {
-        return { passes: false, reason: `Config file excluded: ${pattern}` };
-      }
+    const configHit = matchBuckets(ConfigSkipBuckets, ctx);
+    if (configHit !== null) {
+      return { passes: false, reason: `Config file excluded: ${configHit}` };
     }
 
     return { passes: true, reason: '' };
@@ -172,72 +309,108 @@ class DefaultPatternRule implements FilterRule {
 
 class GitignoreRule implements FilterRule {
   private matcher: Ignore | null;
+  private includeRe: RegExp | null;
+  private dirCache: Map<string, boolean>;
+  private ignoredPaths: Set<string> | null;
 
-  constructor(matcher: Ignore | null) {
+  constructor(matcher: Ignore | null, includeRe: RegExp | null, ignoredPaths: Set<string> | null) {
     this.matcher = matcher;
+    this.includeRe = includeRe;
+    this.dirCache = new Map();
+    this.ignoredPaths = ignoredPaths;
   }
 
-  check(absPath: string, config: ScanConfig): FilterResult {
-    if (!this.matcher || config.gitMode === 'none') {
+  // Gitignore decisions on directories dominate the outcome for their
+  // children, so cache the per-directory verdict and only run the
+  // matcher on the file itself when its directory isn't ignored. The
+  // cache fills lazily walking up: each directory is matched at most
+  // once and inherits an ignored ancestor's verdict without a match.
+  private isDirIgnored(dirRel: string): boolean {
+    let ignored = this.dirCache.get(dirRel);
+    if (ignored === undefined) {
+      const slash = dirRel.lastIndexOf('/');
+      const parentIgnored = slash !== -1 && this.isDirIgnored(dirRel.slice(0, slash));
+      ignored = parentIgnored || this.matcher!.ignores(`${dirRel}/`);
+      this.dirCache.set(dirRel, ignored);
+    }
+    return ignored;
+  }
+
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
+    if (config.gitMode === 'none' || (!this.matcher && !this.ignoredPaths)) {
       return { passes: true, reason: '' };
     }
 
-    const relPath = getRelPath(absPath, config.rootDir);
-    
-    if (this.matcher.ignores(relPath)) {
+    const { relPath } = ctx;
+
+    // Prefer the batched `git check-ignore` verdicts when available;
+    // the JS matcher only handles the root .gitignore.
+    let ignored: boolean;
+    if (this.ignoredPaths) {
+      ignored = this.ignoredPaths.has(relPath);
+    } else {
+      const slash = relPath.lastIndexOf('/');
+      ignored = (slash !== -1 && this.isDirIgnored(relPath.slice(0, slash))) || this.matcher!.ignores(relPath);
+    }
+
+    if (ignored) {
       // Check if explicitly included despite gitignore
-      const name = basename(absPath);
-      for (const pattern of config.includedPatterns) {
-        if (minimatch(name, pattern) || minimatch(relPath, pattern)) {
-          return { passes: true, reason: '' };
-        }
+      if (ctx.isCliIncluded(this.includeRe)) {
+        return { passes: true, reason: '' };
       }
       return { passes: false, reason: 'Matched .gitignore' };
     }
-    
+
     return { passes: true, reason: '' };
   }
 }
 
 class GitTrackingRule implements FilterRule {
   private tracked: Set<string> | null;
+  private includeRe: RegExp | null;
 
-  constructor(tracked: Set<string> | null) {
+  constructor(tracked: Set<string> | null, includeRe: RegExp | null) {
     this.tracked = tracked;
+    this.includeRe = includeRe;
   }
 
-  check(absPath: string, config: ScanConfig): FilterResult {
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
     if (!this.tracked || config.gitMode !== 'full') {
       return { passes: true, reason: '' };
     }
 
-    const relPath = getRelPath(absPath, config.rootDir);
-    
-    if (!this.tracked.has(relPath)) {
+    if (!this.tracked.has(ctx.relPath)) {
       // Allow special files
-      const name = basename(absPath);
-      if (AlwaysInclude.has(name)) {
+      if (isAlwaysIncluded(ctx.name)) {
         return { passes: true, reason: '' };
       }
-      for (const pattern of config.includedPatterns) {
-        if (minimatch(name, pattern)) {
-          return { passes: true, reason: '' };
-        }
+      if (this.includeRe && this.includeRe.test(ctx.name)) {
+        return { passes: true, reason: '' };
       }
       return { passes: false, reason: 'Not tracked by git' };
     }
-    
+
     return { passes: true, reason: '' };
   }
 }
 
 class CharLimitRule implements FilterRule {
-  check(absPath: string, config: ScanConfig): FilterResult {
+  check(ctx: FileContext, config: ScanConfig): FilterResult {
     if (!config.skipLargeFiles || !config.maxFileChars) {
       return { passes: true, reason: '' };
     }
+
+    // A UTF-16 code unit consumes at least one UTF-8 byte, so the char
+    // count never exceeds the byte size: files under the limit in
+    // bytes pass on the cached stat alone, and only the rare oversized
+    // candidates pay for a decode.
+    const stat = ctx.stat();
+    if (stat && stat.size <= config.maxFileChars) {
+      return { passes: true, reason: '' };
+    }
+
     try {
-      const content = readFileSync(absPath, 'utf-8');
+      const content = readFileSync(ctx.absPath, 'utf-8');
       if (content.length > config.maxFileChars) {
         return { passes: false, reason: `Too many chars: ${content.length.toLocaleString()}` };
       }
@@ -251,48 +424,87 @@ class CharLimitRule implements FilterRule {
 export class FileFilter {
   private rules: FilterRule[];
   private config: ScanConfig;
+  // Suffixes that reject on their own unless a name/override/include
+  // escape hatch applies — the verdict for the vast majority of
+  // rejected files, answered before the rule chain runs.
+  private fastExcludeExts: Set<string>;
 
   constructor(
     config: ScanConfig,
     gitignoreMatcher: Ignore | null = null,
-    trackedFiles: Set<string> | null = null
+    trackedFiles: Set<string> | null = null,
+    ignoredPaths: Set<string> | null = null
   ) {
     this.config = config;
-    this.rules = this.buildRules(gitignoreMatcher, trackedFiles);
+    this.rules = this.buildRules(gitignoreMatcher, trackedFiles, ignoredPaths);
+    this.fastExcludeExts = new Set(
+      [...DefaultExcludeBuckets.extSet, ...DataPatternBuckets.extSet].filter(
+        (ext) => !config.typeOverrides.has(ext)
+      )
+    );
   }
 
   private buildRules(
     gitignoreMatcher: Ignore | null,
-    trackedFiles: Set<string> | null
+    trackedFiles: Set<string> | null,
+    ignoredPaths: Set<string> | null
   ): FilterRule[] {
-    const rules: FilterRule[] = [
-      new SkipListRule(),
-      new DirectoryRule(),
-    ];
+    const { excludeRe, includeRe } = this.config;
+
+    // No per-file ancestor-directory check: the scanner prunes both
+    // named and pattern-matched excluded directories during the walk,
+    // so files under them are structurally unreachable here.
+    const rules: FilterRule[] = [new SkipListRule()];
 
     // Git rules
     if (this.config.gitMode === 'gitignore' || this.config.gitMode === 'full') {
-      rules.push(new GitignoreRule(gitignoreMatcher));
+      rules.push(new GitignoreRule(gitignoreMatcher, includeRe, ignoredPaths));
     }
 
     if (this.config.gitMode === 'full') {
-      rules.push(new GitTrackingRule(trackedFiles));
+      rules.push(new GitTrackingRule(trackedFiles, includeRe));
     }
 
-    rules.push(
-      new PatternRule(),
-      new SizeRule(),
-      new BinaryRule(),
-      new DefaultPatternRule(),
-      new CharLimitRule()
-    );
+    // Name/pattern checks are pure string work; keep them ahead of the
+    // rules that stat or open the file so most rejects never touch disk.
+    rules.push(new PatternRule(excludeRe, includeRe), new DefaultPatternRule(includeRe));
+
+    // Rules whose config switch is off would return "pass" for every
+    // file — leave them out of the chain instead of calling them per
+    // file just to hit that early return.
+    if (this.config.maxSizeBytes !== undefined) {
+      rules.push(new SizeRule());
+    }
+    if (!this.config.includeBinary) {
+      rules.push(new BinaryRule());
+    }
+    if (this.config.skipLargeFiles && this.config.maxFileChars) {
+      rules.push(new CharLimitRule());
+    }
 
     return rules;
   }
 
-  shouldInclude(absPath: string): FilterResult {
+  shouldInclude(absPath: string, relPath?: string): FilterResult {
+    const ctx = new FileContext(absPath, this.config.rootDir, relPath);
+
+    // Extension-indexed early verdict: one set lookup settles most
+    // rejects without touching the git or I/O rules. The guards mirror
+    // the escape hatches DefaultPatternRule would have applied.
+    const ext = ctx.ext();
+    if (
+      this.fastExcludeExts.has(ext) &&
+      !isAlwaysIncluded(ctx.name) &&
+      !ctx.isCliIncluded(this.config.includeRe)
+    ) {
+      const reason = DataPatternBuckets.extSet.has(ext)
+        ? `Data format excluded: *${ext}`
+        : `Default exclude: *${ext}`;
+      return { passes: false, reason };
+    }
+
     for (const rule of this.rules) {
-      const result = rule.check(absPath, this.config);
+      const result = rule.check(ctx, this.config);
       if (!result.passes) {
         return result;
       }
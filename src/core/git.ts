@@ -1,17 +1,13 @@
-import { existsSync, readFileSync } from 'node:fs';
+import { readFileSync } from 'node:fs';
 import { join } from 'node:path';
-import { execSync } from 'node:child_process';
+import { execFileSync } from 'node:child_process';
 import ignore, { type Ignore } from 'ignore';
 
 export function loadGitignore(rootDir: string): Ignore | null {
-  const gitignorePath = join(rootDir, '.gitignore');
-  
-  if (!existsSync(gitignorePath)) {
-    return null;
-  }
-
+  // Read directly and treat a missing file like any other read error;
+  // probing with existsSync first would just be a second syscall.
   try {
-    const content = readFileSync(gitignorePath, 'utf-8');
+    const content = readFileSync(join(rootDir, '.gitignore'), 'utf-8');
     const ig = ignore();
     ig.add(content);
     return ig;
@@ -20,26 +16,57 @@ export function loadGitignore(rootDir: string): Ignore | null {
   }
 }
 
-export function getTrackedFiles(rootDir: string): Set<string> | null {
+// Resolve ignore status for all candidate paths in one subprocess
+// instead of matching each file in JS. Returns null when git is
+// unavailable (e.g. not a repository), in which case callers fall
+// back to the pure-JS matcher from loadGitignore.
+export function getIgnoredPaths(rootDir: string, relPaths: string[]): Set<string> | null {
+  if (relPaths.length === 0) {
+    return new Set();
+  }
+
   try {
-    // Check if inside git work tree
-    execSync('git rev-parse --is-inside-work-tree', {
+    const output = execFileSync('git', ['check-ignore', '--stdin', '-z'], {
       cwd: rootDir,
-      stdio: 'pipe',
+      input: relPaths.join('\0'),
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      maxBuffer: 64 * 1024 * 1024,
     });
 
-    // Get list of tracked files
-    const output = execSync('git ls-files', {
+    const ignored = new Set<string>();
+    for (const path of output.split('\0')) {
+      if (path) {
+        ignored.add(path);
+      }
+    }
+    return ignored;
+  } catch (error) {
+    // Exit code 1 means no paths were ignored; anything else means
+    // git failed (missing binary, not a work tree, ...).
+    const status = (error as { status?: number }).status;
+    return status === 1 ? new Set() : null;
+  }
+}
+
+export function getTrackedFiles(rootDir: string): Set<string> | null {
+  try {
+    // A failing ls-files already signals "not a git repository", so no
+    // separate rev-parse probe (and its extra fork/exec) is needed.
+    // NUL delimiters avoid per-line trimming and keep filenames with
+    // unusual characters intact; git emits forward slashes on every
+    // platform, so no separator rewrite is needed either.
+    const output = execFileSync('git', ['ls-files', '-z'], {
       cwd: rootDir,
       encoding: 'utf-8',
       stdio: 'pipe',
+      maxBuffer: 64 * 1024 * 1024,
     });
 
     const files = new Set<string>();
-    for (const line of output.split('\n')) {
-      const trimmed = line.trim();
-      if (trimmed) {
-        files.add(trimmed.replace(/\\/g, '/'));
+    for (const path of output.split('\0')) {
+      if (path) {
+        files.add(path);
       }
     }
 
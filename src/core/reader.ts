@@ -1,58 +1,101 @@
-import { readFileSync, statSync } from 'node:fs';
-import { basename, extname } from 'node:path';
+import { readFile } from 'node:fs/promises';
+import { availableParallelism } from 'node:os';
 import type { FileInfo, ScanConfig } from '../types/index.js';
 import { getLanguage } from '../constants/languages.js';
-import { getRelativePath } from './scanner.js';
-
-export function readFiles(paths: string[], config: ScanConfig): FileInfo[] {
-  const results: FileInfo[] = [];
-
-  for (const absPath of paths) {
-    try {
-      let content = readFileSync(absPath, 'utf-8');
-      const originalLen = content.length;
-      let truncated = false;
-
-      // Truncate if needed
-      if (config.truncateLargeFiles && config.maxFileChars && originalLen > config.maxFileChars) {
-        content = content.slice(0, config.maxFileChars);
-        content += `\n\n... [TRUNCATED: ${originalLen.toLocaleString()} → ${config.maxFileChars.toLocaleString()} chars]`;
-        truncated = true;
-      }
-
-      const lines = content ? content.split('\n').length : 0;
-      const name = basename(absPath);
-      const ext = extname(absPath);
-      const language = getLanguage(name, ext);
-
-      const stat = statSync(absPath);
-
-      results.push({
-        relativePath: getRelativePath(absPath, config.rootDir),
-        absolutePath: absPath,
-        content,
-        sizeBytes: stat.size,
-        lineCount: lines,
-        charCount: content.length,
-        language,
-        percentage: 0, // Calculated later
-        wasTruncated: truncated,
-      });
-    } catch (error) {
-      const relPath = getRelativePath(absPath, config.rootDir);
-      results.push({
-        relativePath: relPath,
-        absolutePath: absPath,
-        content: `# Error reading file: ${error instanceof Error ? error.message : String(error)}`,
-        sizeBytes: 0,
-        lineCount: 0,
-        charCount: 0,
-        language: 'text',
-        percentage: 0,
-        wasTruncated: false,
-      });
+import type { ScannedFile } from './scanner.js';
+
+// File reads are dominated by syscall latency, so overlap them instead
+// of reading one file at a time. Reads are I/O-bound, so oversubscribe
+// the core count; the cap keeps memory and file descriptors bounded.
+const READ_CONCURRENCY = Math.min(32, availableParallelism() * 4);
+
+// Newline bytes never appear inside UTF-8 multi-byte sequences, so
+// counting 0x0A on the raw buffer (memchr under the hood) matches the
+// decoded line count without splitting the string into an array.
+function countLineBreaks(data: Buffer): number {
+  let count = 0;
+  let i = data.indexOf(10);
+  while (i !== -1) {
+    count++;
+    i = data.indexOf(10, i + 1);
+  }
+  return count;
+}
+
+async function readOne(file: ScannedFile, config: ScanConfig): Promise<FileInfo> {
+  // The scanner already derived the POSIX relative path; reuse it and
+  // slice the basename instead of re-relativizing per file.
+  const { absPath, relPath } = file;
+  const slash = relPath.lastIndexOf('/');
+  const name = slash === -1 ? relPath : relPath.slice(slash + 1);
+
+  try {
+    // One read serves everything: the raw byte length doubles as the
+    // on-disk size, so no separate stat() syscall is needed.
+    const data = await readFile(absPath);
+    const sizeBytes = data.byteLength;
+    let content = data.toString('utf-8');
+    const originalLen = content.length;
+    let truncated = false;
+
+    // Truncate if needed
+    if (config.truncateLargeFiles && config.maxFileChars && originalLen > config.maxFileChars) {
+      content = content.slice(0, config.maxFileChars);
+      content += `\n\n... [TRUNCATED: ${originalLen.toLocaleString()} → ${config.maxFileChars.toLocaleString()} chars]`;
+      truncated = true;
     }
+
+    // Truncation appends a marker, so only that (rare) path still pays
+    // for a split.
+    const lines = truncated
+      ? content.split('\n').length
+      : sizeBytes === 0
+        ? 0
+        : countLineBreaks(data) + 1;
+    const language = getLanguage(name);
+
+    return {
+      relativePath: relPath,
+      absolutePath: absPath,
+      fileName: name,
+      content,
+      sizeBytes,
+      lineCount: lines,
+      charCount: content.length,
+      language,
+      wasTruncated: truncated,
+    };
+  } catch (error) {
+    return {
+      relativePath: relPath,
+      absolutePath: absPath,
+      fileName: name,
+      content: `# Error reading file: ${error instanceof Error ? error.message : String(error)}`,
+      sizeBytes: 0,
+      lineCount: 0,
+      charCount: 0,
+      language: 'text',
+      wasTruncated: false,
+    };
   }
+}
+
+export async function readFiles(files: ScannedFile[], config: ScanConfig): Promise<FileInfo[]> {
+  const results: FileInfo[] = new Array(files.length);
+  let next = 0;
+
+  async function worker(): Promise<void> {
+    while (next < files.length) {
+      const index = next++;
+      results[index] = await readOne(files[index]!, config);
+    }
+  }
+
+  const workers = Array.from(
+    { length: Math.min(READ_CONCURRENCY, files.length) },
+    () => worker()
+  );
+  await Promise.all(workers);
 
   return results;
 }
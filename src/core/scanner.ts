@@ -1,79 +1,131 @@
-import { globby } from 'globby';
-import { lstatSync } from 'node:fs';
-import { relative } from 'node:path';
+import { readdirSync } from 'node:fs';
+import { sep } from 'node:path';
 import type { ScanConfig } from '../types/index.js';
 
+export interface ScannedFile {
+  absPath: string;
+  relPath: string;
+}
+
 export interface ScanStats {
   totalScanned: number;
-  includedPaths: string[];
+  files: ScannedFile[];
 }
 
-export async function scanDirectory(config: ScanConfig): Promise<ScanStats> {
-  const { rootDir, maxDepth, excludedDirs, excludedPatterns, includedPatterns, includeOnlyMode } = config;
-
-  // Build ignore patterns for globby
-  const ignorePatterns: string[] = [
-    ...Array.from(excludedDirs).map((dir) => `**/${dir}/**`),
-    ...Array.from(excludedPatterns),
-  ];
-
-  // Build include patterns
-  let patterns: string[];
-  if (includeOnlyMode && includedPatterns.size > 0) {
-    patterns = Array.from(includedPatterns);
-  } else {
-    patterns = ['**/*'];
-  }
+export async function scanDirectory(
+  config: ScanConfig,
+  trackedFiles: Set<string> | null = null
+): Promise<ScanStats> {
+  const { rootDir, maxDepth, excludedDirs, excludeRe } = config;
 
-  try {
-    const globbyOptions: Parameters<typeof globby>[1] = {
-      cwd: rootDir,
-      gitignore: config.gitMode !== 'none',
-      ignore: ignorePatterns,
-      onlyFiles: true,
-      followSymbolicLinks: false,
-      absolute: true,
-      dot: true,
-    };
-
-    if (maxDepth !== undefined) {
-      globbyOptions.deep = maxDepth;
-    }
+  // In full git mode the tracked-file list already names every
+  // candidate, so iterate it directly instead of walking the tree —
+  // ignored subtrees (node_modules, build output, .git) are never
+  // touched at all.
+  if (config.gitMode === 'full' && trackedFiles) {
+    return scanFromTrackedFiles(rootDir, trackedFiles, maxDepth, excludedDirs, excludeRe);
+  }
 
-    const paths = await globby(patterns, globbyOptions);
+  const files: ScannedFile[] = [];
+  let totalScanned = 0;
 
-    // Filter out symlinks and apply additional filters
-    const includedPaths: string[] = [];
-    let totalScanned = 0;
+  // Walk with dirent metadata so file/dir/symlink checks don't cost an
+  // extra stat() per entry. The POSIX relative path is accumulated as
+  // we descend so downstream consumers never recompute it. An explicit
+  // stack instead of recursion keeps deep monorepos from touching the
+  // call-stack limit.
+  try {
+    const stack: Array<{ dir: string; relPrefix: string; depth: number }> = [
+      { dir: rootDir, relPrefix: '', depth: 1 },
+    ];
 
-    for (const absPath of paths) {
-      totalScanned++;
+    while (stack.length > 0) {
+      const { dir, relPrefix, depth } = stack.pop()!;
 
+      let entries;
       try {
-        const stat = lstatSync(absPath);
-        if (stat.isSymbolicLink()) {
+        entries = readdirSync(dir, { withFileTypes: true });
+      } catch {
+        // Skip directories we can't read
+        continue;
+      }
+
+      for (const entry of entries) {
+        if (entry.isSymbolicLink()) {
           continue;
         }
 
-        includedPaths.push(absPath);
-      } catch {
-        // Skip files we can't stat
+        // The parent is already a clean absolute path, so plain concat
+        // avoids join()'s per-entry normalization pass.
+        const absPath = dir + sep + entry.name;
+        const relPath = relPrefix ? `${relPrefix}/${entry.name}` : entry.name;
+
+        if (entry.isDirectory()) {
+          // Prune excluded directories here so their subtrees are never
+          // listed at all, instead of rejecting every descendant later.
+          // This intentionally means --include cannot resurrect files
+          // under an excluded directory, matching git's semantics.
+          if (excludedDirs.has(entry.name) || (excludeRe !== null && excludeRe.test(entry.name))) {
+            continue;
+          }
+          if (maxDepth === undefined || depth < maxDepth) {
+            stack.push({ dir: absPath, relPrefix: relPath, depth: depth + 1 });
+          }
+        } else if (entry.isFile()) {
+          totalScanned++;
+          files.push({ absPath, relPath });
+        }
       }
     }
-
-    return {
-      totalScanned,
-      includedPaths,
-    };
   } catch (error) {
     throw new Error(`Failed to scan directory: ${error instanceof Error ? error.message : String(error)}`);
   }
-}
 
-export function getRelativePath(absPath: string, rootDir: string): string {
-  return relative(rootDir, absPath).split('\\').join('/');
+  return {
+    totalScanned,
+    files,
+  };
 }
 
-export function toPosixPath(path: string): string {
-  return path.split('\\').join('/');
+function scanFromTrackedFiles(
+  rootDir: string,
+  trackedFiles: Set<string>,
+  maxDepth: number | undefined,
+  excludedDirs: ReadonlySet<string>,
+  excludeRe: RegExp | null
+): ScanStats {
+  const files: ScannedFile[] = [];
+  let totalScanned = 0;
+
+  // One alternation regex decides "is any ancestor an excluded dir"
+  // in a single pass over the path, instead of a set lookup per
+  // segment per file.
+  const escaped = [...excludedDirs].map((dir) => dir.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'));
+  const excludedDirRe = escaped.length > 0 ? new RegExp(`(?:^|/)(?:${escaped.join('|')})/`) : null;
+
+  outer: for (const relPath of trackedFiles) {
+    totalScanned++;
+
+    // Apply the same pruning the walker would have: depth cap and
+    // excluded directory segments.
+    if (excludedDirRe !== null && excludedDirRe.test(relPath)) {
+      continue;
+    }
+    const parts = relPath.split('/');
+    if (maxDepth !== undefined && parts.length > maxDepth) {
+      continue;
+    }
+    if (excludeRe !== null) {
+      for (let i = 0; i < parts.length - 1; i++) {
+        if (excludeRe.test(parts[i]!)) {
+          continue outer;
+        }
+      }
+    }
+
+    const absPath = sep === '/' ? `${rootDir}/${relPath}` : rootDir + sep + relPath.split('/').join(sep);
+    files.push({ absPath, relPath });
+  }
+
+  return { totalScanned, files };
 }
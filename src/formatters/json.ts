@@ -1,9 +1,6 @@
 import type { ScanResult } from '../types/index.js';
 
 export function formatJson(result: ScanResult, includeContent = false): string {
-  const totalLines = result.files.reduce((sum, f) => sum + f.lineCount, 0);
-  const totalChars = result.files.reduce((sum, f) => sum + f.charCount, 0);
-
   interface ProjectInfo {
     files: number;
     lines: number;
@@ -21,8 +18,8 @@ export function formatJson(result: ScanResult, includeContent = false): string {
 
   const projectInfo: ProjectInfo = {
     files: result.files.length,
-    lines: totalLines,
-    chars: totalChars,
+    lines: result.totalLines,
+    chars: result.totalChars,
     scanned: result.totalScanned,
     tech_stack: [...result.techStack],
   };
@@ -38,13 +35,16 @@ export function formatJson(result: ScanResult, includeContent = false): string {
     projectInfo.root = result.config.rootDir;
   }
 
+  // Percentages are derived here, the only place they are shown,
+  // instead of being written onto every FileInfo in a separate pass.
+  const totalChars = result.totalChars;
   const output = {
     project: projectInfo,
     files: result.files.map((f) => ({
       path: f.relativePath,
       lines: f.lineCount,
       chars: f.charCount,
-      percentage: Math.round(f.percentage * 100) / 100,
+      percentage: totalChars > 0 ? Math.round((f.charCount / totalChars) * 10000) / 100 : 0,
       language: f.language,
       ...(includeContent ? { content: f.content } : {}),
     })),
@@ -5,15 +5,16 @@ import { homedir } from 'node:os';
 
 const LINE_NUMBERS_NOTE = '> Note: Line numbers are for reference only—not part of the source code.';
 
+// Every file block ends identically; one shared string reference
+// costs nothing per file.
+const CLOSE_FENCE = '\n```\n';
+
 export function formatPreview(result: ScanResult): string {
   const lines: string[] = ['# 📁 Preview - Files to be Included', ''];
 
-  const totalLines = result.files.reduce((sum, f) => sum + f.lineCount, 0);
-  const totalChars = result.files.reduce((sum, f) => sum + f.charCount, 0);
-
   lines.push(`**Files:** ${result.files.length.toLocaleString()}`);
-  lines.push(`**Lines:** ${totalLines.toLocaleString()}`);
-  lines.push(`**Characters:** ${totalChars.toLocaleString()}`);
+  lines.push(`**Lines:** ${result.totalLines.toLocaleString()}`);
+  lines.push(`**Characters:** ${result.totalChars.toLocaleString()}`);
   lines.push('');
   lines.push('## File List');
   lines.push('```');
@@ -26,94 +27,149 @@ export function formatPreview(result: ScanResult): string {
   return lines.join('\n');
 }
 
+// Memoized per result like the tree block: interactive flows can ask
+// for the summary more than once (stats display plus output sink).
+const summaryCache = new WeakMap<ScanResult, string>();
+
 export function formatSummary(result: ScanResult): string {
+  const cached = summaryCache.get(result);
+  if (cached !== undefined) {
+    return cached;
+  }
+
   const sourceLine = result.config.githubRepo
     ? `*GitHub: ${getDisplayName(result.config.githubRepo)}*`
     : `*Directory: ${formatPath(result.config.rootDir)}*`;
 
   const lines: string[] = ['# 📁 Project Structure', sourceLine, ''];
 
-  const tech = result.techStack.size > 0 ? [...result.techStack].join(', ') : 'Unknown';
-  lines.push(`**Stack:** ${tech}`);
+  lines.push(`**Stack:** ${formatTechStack(result)}`);
   lines.push(`**Files:** ${result.files.length.toLocaleString()} of ${result.totalScanned.toLocaleString()} scanned`);
   lines.push('');
 
   lines.push('## Project Tree');
   lines.push('```');
-  lines.push('.');
-  formatTree(result.tree, lines, '');
+  lines.push(renderTree(result));
   lines.push('```');
 
-  return lines.join('\n');
+  const summary = lines.join('\n');
+  summaryCache.set(result, summary);
+  return summary;
 }
 
-export function formatFull(result: ScanResult): string {
+// Shared by both headers so the join runs once per result.
+const techStackCache = new WeakMap<ScanResult, string>();
+
+function formatTechStack(result: ScanResult): string {
+  let tech = techStackCache.get(result);
+  if (tech === undefined) {
+    tech = result.techStack.size > 0 ? [...result.techStack].join(', ') : 'Unknown';
+    techStackCache.set(result, tech);
+  }
+  return tech;
+}
+
+// formatSummary and formatFullParts both embed the tree, and the CLI
+// calls both on the same result — render it once per result instead
+// of twice.
+const treeCache = new WeakMap<ScanResult, string>();
+
+function renderTree(result: ScanResult): string {
+  let rendered = treeCache.get(result);
+  if (rendered === undefined) {
+    const lines: string[] = ['.'];
+    formatTree(result.tree, lines, '');
+    rendered = lines.join('\n');
+    treeCache.set(result, rendered);
+  }
+  return rendered;
+}
+
+// The full output can run to hundreds of megabytes, so it is produced
+// as a list of chunks — one header chunk, then one chunk per file —
+// letting the writer stream sinks that don't need a single string.
+export function formatFullParts(result: ScanResult): string[] {
   const sourceLine = result.config.githubRepo
     ? `*GitHub: [\`${getDisplayName(result.config.githubRepo)}\`](https://github.com/${getFullName(result.config.githubRepo)})*`
     : `*Directory: \`${formatPath(result.config.rootDir)}\`*`;
 
-  const lines: string[] = ['# 📁 Project Context', sourceLine, ''];
-
-  const totalLines = result.files.reduce((sum, f) => sum + f.lineCount, 0);
-  const totalChars = result.files.reduce((sum, f) => sum + f.charCount, 0);
-  const tech = result.techStack.size > 0 ? [...result.techStack].join(', ') : 'Unknown';
-
-  lines.push('## Overview');
-  lines.push(`- **Stack:** ${tech}`);
-  lines.push(`- **Files:** ${result.files.length.toLocaleString()}`);
-  lines.push(`- **Lines:** ${totalLines.toLocaleString()}`);
-  lines.push(`- **Size:** ~${(totalChars / 1024).toFixed(1)} KB`);
-  lines.push('');
-  lines.push('## Structure');
-  lines.push('```');
-  lines.push('.');
-  formatTree(result.tree, lines, '');
-  lines.push('```');
-  lines.push('');
-  lines.push('---');
-  lines.push('');
-  lines.push('## Source Files');
-  lines.push('');
+  let header = `# 📁 Project Context\n${sourceLine}\n\n`;
+  header += '## Overview\n';
+  header += `- **Stack:** ${formatTechStack(result)}\n`;
+  header += `- **Files:** ${result.files.length.toLocaleString()}\n`;
+  header += `- **Lines:** ${result.totalLines.toLocaleString()}\n`;
+  header += `- **Size:** ~${(result.totalChars / 1024).toFixed(1)} KB\n\n`;
+  header += '## Structure\n```\n';
+  header += renderTree(result);
+  header += '\n```\n\n---\n\n## Source Files\n';
+
+  const parts: string[] = [header];
+
+  // Three chunks per file, with the body chunk aliasing the FileInfo
+  // string itself (when line numbers are off) — file contents, the
+  // dominant share of the output, are never copied into the chunk
+  // list, so peak memory stays at roughly one copy of the content.
+  const lineNumbers = result.config.lineNumbers;
+  const note = lineNumbers ? `${LINE_NUMBERS_NOTE}\n\n` : '';
 
   for (const f of result.files) {
-    const header = getFileHeader(f);
-    lines.push(header);
-    lines.push(`*${f.lineCount.toLocaleString()} lines • ${f.charCount.toLocaleString()} chars*`);
-    lines.push('');
-    if (result.config.lineNumbers) {
-      lines.push(LINE_NUMBERS_NOTE);
-      lines.push('');
-    }
-    lines.push(`\`\`\`${f.language}`);
-    const content = result.config.lineNumbers ? addLineNumbers(f.content) : f.content;
-    lines.push(content);
-    lines.push('```');
-    lines.push('');
+    parts.push(
+      `\n${getFileHeader(f)}\n*${f.lineCount.toLocaleString()} lines • ${f.charCount.toLocaleString()} chars*\n\n${note}\`\`\`${f.language}\n`
+    );
+    parts.push(lineNumbers ? addLineNumbers(f.content) : f.content);
+    parts.push(CLOSE_FENCE);
   }
 
-  return lines.join('\n').trim();
+  // Match the old single-string output, which was trimmed at the end.
+  const last = parts[parts.length - 1]!;
+  parts[parts.length - 1] = last.replace(/\s+$/, '');
+
+  return parts;
+}
+
+export function formatFull(result: ScanResult): string {
+  return formatFullParts(result).join('');
 }
 
+// The home directory can't change mid-process; resolve it once.
+const HOME_DIR = homedir();
+
 function formatPath(path: string): string {
-  const home = homedir();
-  if (path.startsWith(home)) {
-    return `~${path.slice(home.length)}`;
+  if (path.startsWith(HOME_DIR)) {
+    return `~${path.slice(HOME_DIR.length)}`;
   }
   return path;
 }
 
+// The four connector/icon pairings are fixed, so build them once
+// instead of re-concatenating glyph, space and icon for every node.
+const BRANCH_CHILD_DIR = `${GLYPH_CHILD} 📁 `;
+const BRANCH_CHILD_FILE = `${GLYPH_CHILD} 📄 `;
+const BRANCH_LAST_DIR = `${GLYPH_LAST} 📁 `;
+const BRANCH_LAST_FILE = `${GLYPH_LAST} 📄 `;
+
+// Explicit-stack DFS instead of recursion: deep trees stay clear of
+// the call-stack limit and each node's child prefix is built exactly
+// once. Children are pushed in reverse so pop order matches the
+// recursive output.
 function formatTree(nodes: TreeNode[], lines: string[], prefix: string): void {
-  for (let i = 0; i < nodes.length; i++) {
-    const node = nodes[i]!;
-    const isLast = i === nodes.length - 1;
-    const connector = isLast ? GLYPH_LAST : GLYPH_CHILD;
+  const stack: Array<{ node: TreeNode; prefix: string; isLast: boolean }> = [];
+
+  for (let i = nodes.length - 1; i >= 0; i--) {
+    stack.push({ node: nodes[i]!, prefix, isLast: i === nodes.length - 1 });
+  }
+
+  while (stack.length > 0) {
+    const { node, prefix: nodePrefix, isLast } = stack.pop()!;
 
     if (!node.included && node.children.length === 0) {
       continue;
     }
 
-    const icon = node.isDir ? '📁' : '📄';
-    let line = `${prefix}${connector} ${icon} ${node.name}`;
+    const branch = isLast
+      ? (node.isDir ? BRANCH_LAST_DIR : BRANCH_LAST_FILE)
+      : (node.isDir ? BRANCH_CHILD_DIR : BRANCH_CHILD_FILE);
+    let line = nodePrefix + branch + node.name;
 
     if (!node.isDir && node.included) {
       line += ` (${node.lines.toLocaleString()}L)`;
@@ -122,8 +178,11 @@ function formatTree(nodes: TreeNode[], lines: string[], prefix: string): void {
     lines.push(line);
 
     if (node.children.length > 0) {
-      const childPrefix = prefix + (isLast ? GLYPH_SPACE : GLYPH_PIPE);
-      formatTree(node.children, lines, childPrefix);
+      const childPrefix = nodePrefix + (isLast ? GLYPH_SPACE : GLYPH_PIPE);
+      const children = node.children;
+      for (let i = children.length - 1; i >= 0; i--) {
+        stack.push({ node: children[i]!, prefix: childPrefix, isLast: i === children.length - 1 });
+      }
     }
   }
 }
@@ -136,29 +195,30 @@ function addLineNumbers(content: string): string {
     .join('\n');
 }
 
+const FILE_ICONS: Record<string, string> = {
+  '.py': '🐍',
+  '.go': '🐹',
+  '.rs': '🦀',
+  '.ts': '📘',
+  '.tsx': '📘',
+  '.js': '📒',
+  '.jsx': '📒',
+  '.json': '⚙️',
+  '.md': '📝',
+};
+
 function getFileHeader(f: FileInfo): string {
-  const name = f.relativePath.split('/').pop()?.toLowerCase() ?? '';
-  const ext = name.includes('.') ? `.${name.split('.').pop()}` : '';
-
-  const icons: Record<string, string> = {
-    readme: '📖',
-    '.py': '🐍',
-    '.go': '🐹',
-    '.rs': '🦀',
-    '.ts': '📘',
-    '.tsx': '📘',
-    '.js': '📒',
-    '.jsx': '📒',
-    '.json': '⚙️',
-    '.md': '📝',
-  };
+  // One suffix lookup instead of substring-scanning the name against
+  // every icon key; READMEs are the only name-based special case.
+  const name = f.fileName.toLowerCase();
+  const dot = name.lastIndexOf('.');
+  const ext = dot > 0 ? name.slice(dot) : '';
 
   let icon = '📄';
-  for (const [key, emoji] of Object.entries(icons)) {
-    if (name.includes(key) || ext === key) {
-      icon = emoji;
-      break;
-    }
+  if (name.includes('readme')) {
+    icon = '📖';
+  } else {
+    icon = FILE_ICONS[ext] ?? '📄';
   }
 
   return `### ${icon} \`${f.relativePath}\``;
@@ -1,11 +1,32 @@
-import { writeFileSync, mkdirSync } from 'node:fs';
+import { writeFileSync, mkdirSync, openSync, writeSync, closeSync } from 'node:fs';
 import { dirname } from 'node:path';
+import { spawn } from 'node:child_process';
 import clipboard from 'clipboardy';
 import chalk from 'chalk';
 import type { ScanConfig } from '../types/index.js';
 
+// Content arrives either as one string or as the formatter's chunk
+// list; the file sink streams chunks so the full output never has to
+// be materialized, while sinks that need a single string join once.
+export type OutputContent = string | string[];
+
+function asString(content: OutputContent): string {
+  return typeof content === 'string' ? content : content.join('');
+}
+
+export function contentLength(content: OutputContent): number {
+  if (typeof content === 'string') {
+    return content.length;
+  }
+  let total = 0;
+  for (const chunk of content) {
+    total += chunk.length;
+  }
+  return total;
+}
+
 export async function writeOutput(
-  content: string,
+  content: OutputContent,
   summary: string,
   config: ScanConfig
 ): Promise<boolean> {
@@ -21,7 +42,7 @@ export async function writeOutput(
   }
 }
 
-function writeToFile(content: string, summary: string, outputFile?: string): boolean {
+function writeToFile(content: OutputContent, summary: string, outputFile?: string): boolean {
   if (!outputFile) {
     console.error(chalk.red('❌ No output file specified'));
     return false;
@@ -29,7 +50,20 @@ function writeToFile(content: string, summary: string, outputFile?: string): boo
 
   try {
     mkdirSync(dirname(outputFile), { recursive: true });
-    writeFileSync(outputFile, content, 'utf-8');
+    if (typeof content === 'string') {
+      writeFileSync(outputFile, content, 'utf-8');
+    } else {
+      // Write chunk by chunk so only one chunk is UTF-8-encoded at a
+      // time instead of one giant joined copy.
+      const fd = openSync(outputFile, 'w');
+      try {
+        for (const chunk of content) {
+          writeSync(fd, chunk);
+        }
+      } finally {
+        closeSync(fd);
+      }
+    }
     console.error(summary);
     console.error(chalk.green(`\n✅ Written to ${outputFile}`));
     return true;
@@ -39,21 +73,75 @@ function writeToFile(content: string, summary: string, outputFile?: string): boo
   }
 }
 
-function writeToStdout(content: string): boolean {
+function writeToStdout(content: OutputContent): boolean {
+  // Write directly to the stream — console.log would re-scan a large
+  // string while formatting. A closed pipe (e.g. `| head`) is normal
+  // downstream behavior, not an error.
   try {
-    console.log(content);
+    const chunks = typeof content === 'string' ? [content] : content;
+    for (const chunk of chunks) {
+      process.stdout.write(chunk);
+    }
+    process.stdout.write('\n');
     return true;
   } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === 'EPIPE') {
+      return true;
+    }
     console.error(chalk.red(`❌ Error writing to stdout: ${error instanceof Error ? error.message : String(error)}`));
     return false;
   }
 }
 
-async function writeToClipboard(content: string, summary: string): Promise<boolean> {
+function nativeClipboardCommand(): { cmd: string; args: string[] } | null {
+  if (process.platform === 'darwin') {
+    return { cmd: 'pbcopy', args: [] };
+  }
+  if (process.platform === 'linux') {
+    return process.env.WAYLAND_DISPLAY
+      ? { cmd: 'wl-copy', args: [] }
+      : { cmd: 'xclip', args: ['-selection', 'clipboard'] };
+  }
+  return null;
+}
+
+// Pipe chunks straight into the platform clipboard helper so large
+// payloads never get staged as one extra in-process copy. Resolves
+// false (rather than rejecting) when the helper is missing or fails,
+// letting the caller fall back to clipboardy.
+function copyViaNativePipe(content: OutputContent): Promise<boolean> {
+  const native = nativeClipboardCommand();
+  if (!native) {
+    return Promise.resolve(false);
+  }
+
+  return new Promise((resolve) => {
+    const child = spawn(native.cmd, native.args, { stdio: ['pipe', 'ignore', 'ignore'] });
+    child.on('error', () => resolve(false));
+    child.on('close', (code) => resolve(code === 0));
+
+    const stdin = child.stdin;
+    stdin.on('error', () => {});
+
+    const chunks = typeof content === 'string' ? [content] : content;
+    void (async () => {
+      for (const chunk of chunks) {
+        if (!stdin.write(chunk)) {
+          await new Promise((drained) => stdin.once('drain', drained));
+        }
+      }
+      stdin.end();
+    })();
+  });
+}
+
+async function writeToClipboard(content: OutputContent, summary: string): Promise<boolean> {
   try {
     console.error(summary);
-    await clipboard.write(content);
-    console.error(chalk.green(`\n✅ ${content.length.toLocaleString()} chars copied to clipboard`));
+    if (!(await copyViaNativePipe(content))) {
+      await clipboard.write(asString(content));
+    }
+    console.error(chalk.green(`\n✅ ${contentLength(content).toLocaleString()} chars copied to clipboard`));
     return true;
   } catch (error) {
     console.error(chalk.yellow('⚠️ Clipboard not available, printing to stdout'));
@@ -26,24 +26,35 @@ export interface ScanConfig {
   truncateLargeFiles: boolean;
   skipLargeFiles: boolean;
 
-  excludedDirs: Set<string>;
+  excludedDirs: ReadonlySet<string>;
   excludedPatterns: Set<string>;
   includedPatterns: Set<string>;
 
-  typeOverrides: Map<string, boolean>;
+  // Compiled once from the pattern sets at config build time so the
+  // per-file rules never re-derive them.
+  excludeRe: RegExp | null;
+  includeRe: RegExp | null;
+
+  // Suffixes re-enabled via --include-* flags (e.g. '.json').
+  typeOverrides: ReadonlySet<string>;
 
   githubRepo?: GitHubRepo | undefined;
 }
 
+// Fully populated by the reader in a single pass — size, line and char
+// counts come from the one read, so formatters consuming FileInfo must
+// never touch the filesystem again.
 export interface FileInfo {
   relativePath: string;
   absolutePath: string;
+  // Basename, computed once at read time; sorting and formatting both
+  // need it and would otherwise re-split the path.
+  fileName: string;
   content: string;
   sizeBytes: number;
   lineCount: number;
   charCount: number;
   language: string;
-  percentage: number;
   wasTruncated: boolean;
 }
 
@@ -54,8 +65,6 @@ export interface TreeNode {
   included: boolean;
   children: TreeNode[];
   lines: number;
-  chars: number;
-  percentage: number;
 }
 
 export interface ScanResult {
@@ -63,6 +72,10 @@ export interface ScanResult {
   files: FileInfo[];
   tree: TreeNode[];
   totalScanned: number;
+  // Aggregated once during analysis so formatters don't re-reduce the
+  // file list.
+  totalLines: number;
+  totalChars: number;
   techStack: Set<string>;
   keyDirs: string[];
   duration: number;